@@ -1,11 +1,23 @@
 """Handles text embedding using a pre-trained sentence transformer model."""
 
-from sentence_transformers import SentenceTransformer
-
-# Initialize the sentence transformer model.
 # 'all-MiniLM-L6-v2' is a good choice for generating sentence embeddings
 # due to its balance of speed and performance.
-model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+
+_model = None
+
+def get_model():
+    """
+    Returns the sentence transformer model, loading it on first use.
+
+    sentence_transformers pulls in torch and the model weights, so importing
+    this module stays cheap until an embedding is actually requested.
+    """
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+        _model = SentenceTransformer(MODEL_NAME)
+    return _model
 
 def embed_text(text: str):
     """
@@ -17,4 +29,4 @@ def embed_text(text: str):
     Returns:
         A list of floats representing the embedding of the input text.
     """
-    return model.encode(text).tolist()
\ No newline at end of file
+    return get_model().encode(text).tolist()
@@ -26,7 +26,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field
 
-from embedder import embed_text
+from embedder import embed_text, get_model
 from neo4j_retriever import retrieve_top_k_tools
 from Utils.get_MCP_config import extract_config_from_github_async
 from Utils.get_available_env_keys import get_available_env_keys_from_dotenv
@@ -181,21 +181,25 @@ async def dynamic_tool_retriever(input: DynamicRetrieverInput) -> List[Dict[str,
     logger.info(f"Processing task: '{input.task_description}' (top_k={input.top_k}, official_only={input.official_only})")
     
     try:
-        # Step 1: Generate semantic embedding using local Sentence Transformers
-        query_embedding = embed_text(input.task_description)
+        # Step 1: Generate semantic embedding using local Sentence Transformers.
+        # Encoding is CPU-bound, so keep it off the event loop.
+        query_embedding = await asyncio.to_thread(embed_text, input.task_description)
         logger.debug("Successfully generated task embedding using local model")
         
-        # Step 2: Retrieve expanded candidate set from Neo4j
+        # Steps 2-3: Retrieve expanded candidate set from Neo4j and get available
+        # environment keys. Both are blocking I/O, so run them concurrently in
+        # worker threads to keep the event loop free.
         candidate_count = input.top_k * CANDIDATE_MULTIPLIER
-        initial_tools = retrieve_top_k_tools(
-            query_embedding, 
-            candidate_count, 
-            official_only=input.official_only
+        initial_tools, available_keys = await asyncio.gather(
+            asyncio.to_thread(
+                retrieve_top_k_tools,
+                query_embedding, 
+                candidate_count, 
+                official_only=input.official_only
+            ),
+            asyncio.to_thread(get_available_env_keys_from_dotenv),
         )
         logger.info(f"Retrieved {len(initial_tools)} initial candidate tools")
-        
-        # Step 3: Get available environment keys
-        available_keys = get_available_env_keys_from_dotenv()
         logger.debug(f"Found {len(available_keys)} available environment keys")
         
         # Step 4: Fetch MCP configurations asynchronously with timeout and concurrency control
@@ -269,4 +273,6 @@ async def dynamic_tool_retriever(input: DynamicRetrieverInput) -> List[Dict[str,
 
 if __name__ == "__main__":
     logger.info(f"Starting {SERVER_NAME} server...")
+    # Load the embedding model before serving so the first request doesn't pay for it
+    get_model()
     mcp.run(transport="stdio")
\ No newline at end of file
@@ -16,17 +16,69 @@ Date: July 2025
 """
 
 import os
-import json
-import subprocess
+import asyncio
+import heapq
 import logging
 import time
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+import orjson
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 CONFIG_FILE = "mcp_proxy_servers.json"
 CLIENT_CONFIG_FILE = "mcp_client_config.json"
+PROXY_STOP_TIMEOUT = 10.0  # Seconds to wait for mcp-proxy to exit before killing it
+CONFIG_DEBOUNCE_DELAY = 0.2  # Seconds to coalesce add/remove bursts into one restart
+POLL_BACKOFF_STEPS = ((4, 0.1), (20, 0.2))  # (polls made, delay) steps for wait_until
+
+def _write_json_atomic(path, data):
+    """
+    Write JSON to a file atomically.
+    
+    The data is written to a temporary sibling file which then replaces the
+    target, so readers such as mcp-proxy never observe a partially written file.
+    
+    Args:
+        path (str): Destination file path
+        data (Dict): JSON-serializable data to write
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, path)
+
+async def wait_until(predicate, *, timeout=None, base=0.05, steps=POLL_BACKOFF_STEPS):
+    """
+    Poll an async predicate with stepped backoff until it returns True.
+    
+    Polls every `base` seconds at first and slows down as the wait drags on:
+    with the defaults, 50ms, then 100ms after 4 polls and 200ms after 20.
+    Quick waits stay responsive while long ones stop hammering the target.
+    
+    Args:
+        predicate (Callable[[], Awaitable[bool]]): Returns True when the wait is over
+        timeout (float, optional): Maximum time to wait in seconds. None waits indefinitely.
+        base (float, optional): Initial delay between polls in seconds. Defaults to 0.05.
+        steps (tuple, optional): (poll count, delay) pairs in ascending order of poll count
+    
+    Returns:
+        bool: True if the predicate succeeded, False if the timeout elapsed
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    polls = 0
+    delay = base
+    while not await predicate():
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        polls += 1
+        for threshold, step_delay in steps:
+            if polls >= threshold:
+                delay = step_delay
+        await asyncio.sleep(delay)
+    return True
 
 class MCPServerConfig:
     """
@@ -80,6 +132,22 @@ class MCPServerConfig:
             "transportType": "stdio"
         }
 
+@dataclass(slots=True)
+class ServerState:
+    """
+    Runtime state of a server managed by MCPServerManager.
+    
+    Attributes:
+        config (dict): Server configuration containing command, args, env, cwd
+        endpoint (str): Cached HTTP endpoint of the server behind the proxy
+        popular (bool): Whether the server is pre-configured and exempt from idle cleanup
+        last_used (Optional[float]): Monotonic timestamp of the last use, if any
+    """
+    config: dict
+    endpoint: str
+    popular: bool = False
+    last_used: Optional[float] = None
+
 class MCPServerManager:
     """
     Main manager class for MCP servers with dynamic configuration and proxy management.
@@ -90,17 +158,16 @@ class MCPServerManager:
     
     Features:
     - Dynamic server addition/removal
-    - Automatic proxy restart on configuration changes
+    - Automatic non-blocking proxy restart on configuration changes
     - Idle server cleanup with configurable TTL
     - Client configuration generation for SSE connections
     - Popular server pre-configuration
     
     Attributes:
         popular_servers (Dict[str, dict]): Pre-configured servers that are always available
-        dynamic_servers (Dict[str, dict]): Dynamically added servers
-        last_used (Dict[str, float]): Timestamp tracking for idle cleanup
+        servers (Dict[str, ServerState]): State of every managed server, popular and dynamic
         proxy_port (int): Port number for the mcp-proxy server
-        proxy_proc (subprocess.Popen): Process handle for the running proxy
+        proxy_proc (asyncio.subprocess.Process): Process handle for the running proxy
     """
     
     def __init__(self, popular_servers: Dict[str, dict], proxy_port: int = 9000):
@@ -113,10 +180,55 @@ class MCPServerManager:
             proxy_port (int, optional): Port for mcp-proxy server. Defaults to 9000.
         """
         self.popular_servers = popular_servers
-        self.dynamic_servers = {}  # name -> config
-        self.last_used = {}        # name -> timestamp
         self.proxy_port = proxy_port
         self.proxy_proc = None
+        self.servers: Dict[str, ServerState] = {
+            name: ServerState(config, self._endpoint_for(name), popular=True)
+            for name, config in popular_servers.items()
+        }
+        self._usage_heap = []              # (timestamp, name) min-heap for idle cleanup
+        self._proxy_lock = asyncio.Lock()  # Serializes proxy restarts
+        self._apply_task = None            # Pending debounced config apply
+        self._closed = False               # Set by stop(); blocks further restarts
+        self._cleanup_ttl = None           # Idle TTL while cleanup is scheduled
+        self._cleanup_handle = None        # Timer for the next idle cleanup
+        self._cleanup_task = None          # Idle cleanup currently running
+
+    def _touch(self, name):
+        """
+        Record a use of a server for idle cleanup.
+        
+        Pushes the new timestamp onto the usage heap; older entries for the same
+        server become stale and are skipped when popped. The heap is rebuilt from
+        the server states once stale entries dominate, keeping its size bounded.
+        
+        Args:
+            name (str): Name of the server that was used
+        """
+        state = self.servers.get(name)
+        if state is None:
+            return
+        state.last_used = now = time.monotonic()
+        heapq.heappush(self._usage_heap, (now, name))
+        if len(self._usage_heap) > 2 * len(self.servers) + 16:
+            self._usage_heap = [
+                (st.last_used, n) for n, st in self.servers.items() if st.last_used is not None
+            ]
+            heapq.heapify(self._usage_heap)
+
+    def _endpoint_for(self, name):
+        """
+        Format the HTTP endpoint of a server behind the proxy.
+        
+        Called once per server when its state is created; listings reuse the result.
+        
+        Args:
+            name (str): Name of the server
+        
+        Returns:
+            str: Endpoint in the form "http://localhost:port/servers/name/"
+        """
+        return f"http://localhost:{self.proxy_port}/servers/{name}/"
 
     def _build_proxy_config(self):
         """
@@ -130,8 +242,8 @@ class MCPServerManager:
                   all server configurations in proxy-compatible format
         """
         servers = {}
-        for name, cfg in {**self.popular_servers, **self.dynamic_servers}.items():
-            servers[name] = MCPServerConfig(name, **cfg).to_proxy_dict()
+        for name, state in self.servers.items():
+            servers[name] = MCPServerConfig(name, **state.config).to_proxy_dict()
         return {"mcpServers": servers}
 
     def _write_proxy_config(self):
@@ -142,58 +254,165 @@ class MCPServerManager:
         also triggers client configuration update for SSE endpoints.
         """
         config = self._build_proxy_config()
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-        logger.info(f"Wrote mcp-proxy config with servers: {list(config['mcpServers'].keys())}")
+        _write_json_atomic(CONFIG_FILE, config)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Wrote mcp-proxy config with servers: {list(config['mcpServers'].keys())}")
         
         # Also write client configuration
         self._write_client_config()
 
-    def _start_proxy(self):
+    async def _terminate_proxy(self):
+        """
+        Terminate the running mcp-proxy process without blocking the event loop.
+        
+        Sends SIGTERM and awaits exit for up to PROXY_STOP_TIMEOUT seconds,
+        killing the process if it does not shut down in time.
+        """
+        proc, self.proxy_proc = self.proxy_proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            proc.terminate()
+            await asyncio.wait_for(proc.wait(), timeout=PROXY_STOP_TIMEOUT)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            logger.warning(f"mcp-proxy did not exit within {PROXY_STOP_TIMEOUT}s, killing it")
+            proc.kill()
+            await proc.wait()
+
+    async def _start_proxy(self):
         """
         Start or restart the mcp-proxy server process.
         
         Terminates any existing proxy process and starts a new one with the current
         configuration. The proxy will serve on the configured port and load server
-        configurations from the generated config file.
-        """
-        if self.proxy_proc:
-            logger.info("Stopping existing mcp-proxy...")
-            self.proxy_proc.terminate()
-            self.proxy_proc.wait()
-        cmd = [
-            "mcp-proxy",
-            f"--port={self.proxy_port}",
-            "--named-server-config", CONFIG_FILE
-        ]
-        logger.info(f"Starting mcp-proxy: {' '.join(cmd)}")
-        self.proxy_proc = subprocess.Popen(cmd)
-        logger.info(f"mcp-proxy started on port {self.proxy_port}")
-
-    def start(self):
+        configurations from the generated config file. Restarts are serialized so
+        concurrent configuration changes never run two proxies on the same port.
+        Does nothing once the manager has been stopped.
+        """
+        async with self._proxy_lock:
+            if self._closed:
+                return
+            if self.proxy_proc:
+                logger.info("Stopping existing mcp-proxy...")
+                await self._terminate_proxy()
+            cmd = [
+                "mcp-proxy",
+                f"--port={self.proxy_port}",
+                "--named-server-config", CONFIG_FILE
+            ]
+            logger.info(f"Starting mcp-proxy: {' '.join(cmd)}")
+            self.proxy_proc = await asyncio.create_subprocess_exec(*cmd)
+            logger.info(f"mcp-proxy started on port {self.proxy_port}")
+
+    async def _apply_config(self):
+        """
+        Write the current configuration and restart the proxy, coalescing bursts.
+        
+        The first change opens a CONFIG_DEBOUNCE_DELAY window; every change made
+        within it shares one config write and proxy restart, and all callers wait
+        for that restart to finish. Once the manager is stopped, changes are
+        only recorded in memory.
+        """
+        if self._closed:
+            return
+        if self._apply_task is None:
+            self._apply_task = asyncio.create_task(self._apply_after_delay())
+        task = self._apply_task
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # stop() cancelled the pending apply; only propagate our own cancellation
+            if not task.cancelled() or asyncio.current_task().cancelling():
+                raise
+
+    async def _apply_after_delay(self):
+        """Apply the configuration once the debounce window has closed."""
+        await asyncio.sleep(CONFIG_DEBOUNCE_DELAY)
+        # Changes made from here on need a fresh write and restart
+        self._apply_task = None
+        if self._closed:
+            return
+        self._write_proxy_config()
+        await self._start_proxy()
+
+    async def wait_until_ready(self, timeout=30.0):
+        """
+        Wait until the mcp-proxy server accepts connections on its port.
+        
+        Probes the proxy port with stepped backoff instead of sleeping for a
+        fixed interval, so startup only waits as long as the proxy actually needs.
+        
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds. Defaults to 30.0.
+        
+        Returns:
+            bool: True once the proxy accepts connections, False if the proxy
+                  process exited or the timeout elapsed
+        """
+        def proxy_running():
+            return self.proxy_proc is not None and self.proxy_proc.returncode is None
+
+        async def proxy_settled():
+            # Stop polling early if the proxy process has exited
+            if not proxy_running():
+                return True
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection("127.0.0.1", self.proxy_port), timeout=1.0
+                )
+            except (OSError, asyncio.TimeoutError):
+                return False
+            writer.close()
+            await writer.wait_closed()
+            return True
+
+        ready = await wait_until(proxy_settled, timeout=timeout)
+        if not proxy_running():
+            logger.error("mcp-proxy is not running")
+            return False
+        if not ready:
+            logger.warning(f"mcp-proxy not ready on port {self.proxy_port} after {timeout}s")
+            return False
+        logger.info(f"mcp-proxy is accepting connections on port {self.proxy_port}")
+        return True
+
+    async def start(self):
         """
         Initialize and start the MCP proxy manager.
         
         This method writes the initial configuration and starts the proxy server.
         Should be called once during manager initialization.
         """
+        self._closed = False
         self._write_proxy_config()
-        self._start_proxy()
+        await self._start_proxy()
 
-    def stop(self):
+    async def stop(self):
         """
         Stop the MCP proxy server and clean up resources.
         
         Terminates the proxy process gracefully and sets the process handle to None.
-        Should be called during manager shutdown.
-        """
-        if self.proxy_proc:
-            logger.info("Stopping mcp-proxy...")
-            self.proxy_proc.terminate()
-            self.proxy_proc.wait()
-            self.proxy_proc = None
+        Should be called during manager shutdown. A debounced restart that is
+        still pending is cancelled, as is any idle cleanup pass in progress, so
+        no proxy is started after this returns.
+        """
+        self._closed = True
+        cleanup_task = self._cleanup_task
+        self.stop_idle_cleanup()
+        apply_task, self._apply_task = self._apply_task, None
+        if apply_task is not None:
+            apply_task.cancel()
+        pending = [task for task in (cleanup_task, apply_task) if task is not None]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        async with self._proxy_lock:
+            if self.proxy_proc:
+                logger.info("Stopping mcp-proxy...")
+                await self._terminate_proxy()
 
-    def add_server(self, name, config):
+    async def add_server(self, name, config):
         """
         Dynamically add a new MCP server to the manager.
         
@@ -202,31 +421,45 @@ class MCPServerManager:
             config (dict): Server configuration containing command, args, env, etc.
                           Format: {command: str, args: List[str], env: Dict, cwd: str}
         
-        The server will be immediately available through the proxy after addition.
-        """
+        The server is available through the proxy once this returns. Additions
+        made in quick succession are applied with a single proxy restart.
+        Re-adding a server with an unchanged configuration only refreshes its
+        last used timestamp, skipping the proxy restart and backend respawn.
+        """
+        state = self.servers.get(name)
+        if state is not None and state.config == config:
+            logger.info(f"Server {name} already configured, skipping proxy restart")
+            self._touch(name)
+            return
         logger.info(f"Adding server {name}")
-        self.dynamic_servers[name] = config
-        self.last_used[name] = time.time()
-        self._write_proxy_config()
-        self._start_proxy()
+        if state is None:
+            self.servers[name] = ServerState(config, self._endpoint_for(name))
+        else:
+            state.config = config
+        self._touch(name)
+        await self._apply_config()
 
-    def remove_server(self, name):
+    async def remove_server(self, name):
         """
         Remove a dynamically added server from the manager.
         
         Args:
             name (str): Name of the server to remove
         
-        Note: Popular servers cannot be removed through this method.
-        The proxy will be restarted to reflect the configuration change.
+        Note: Popular servers cannot be removed through this method; removing one
+        only reverts any configuration override made with add_server. The proxy
+        will be restarted to reflect the configuration change; removals made in
+        quick succession share a single restart.
         """
         logger.info(f"Removing server {name}")
-        if name in self.dynamic_servers:
-            del self.dynamic_servers[name]
-        if name in self.last_used:
-            del self.last_used[name]
-        self._write_proxy_config()
-        self._start_proxy()
+        state = self.servers.get(name)
+        if state is not None:
+            if state.popular:
+                state.config = self.popular_servers[name]
+                state.last_used = None
+            else:
+                del self.servers[name]
+        await self._apply_config()
 
     def mark_used(self, name):
         """
@@ -237,9 +470,9 @@ class MCPServerManager:
         
         This is used for idle cleanup to prevent removal of actively used servers.
         """
-        self.last_used[name] = time.time()
+        self._touch(name)
 
-    def cleanup_idle(self, ttl=600):
+    async def cleanup_idle(self, ttl=600):
         """
         Remove idle servers that haven't been used within the TTL period.
         
@@ -247,13 +480,72 @@ class MCPServerManager:
             ttl (int, optional): Time-to-live in seconds. Defaults to 600 (10 minutes).
         
         Only dynamically added servers are subject to cleanup. Popular servers
-        are never removed by this method.
+        are never removed by this method. Only heap entries older than the TTL
+        are visited, so servers that are still fresh cost nothing per call.
+        """
+        cutoff = time.monotonic() - ttl
+        to_remove = []
+        while self._usage_heap and self._usage_heap[0][0] < cutoff:
+            last, name = heapq.heappop(self._usage_heap)
+            state = self.servers.get(name)
+            if (state is not None and state.last_used == last and not state.popular
+                    and name not in to_remove):
+                to_remove.append(name)
+        if to_remove:
+            await asyncio.gather(*(self.remove_server(name) for name in to_remove))
+
+    def start_idle_cleanup(self, ttl=600):
         """
-        now = time.time()
-        to_remove = [name for name, last in self.last_used.items()
-                     if name not in self.popular_servers and now - last > ttl]
-        for name in to_remove:
-            self.remove_server(name)
+        Schedule idle cleanup to run in the background.
+        
+        Args:
+            ttl (int, optional): Time-to-live in seconds. Defaults to 600 (10 minutes).
+        
+        Cleanup is driven by a single event loop timer that fires when the
+        least recently used server could next expire, rather than by a polling
+        task. The timer and any pass in progress are cancelled by
+        stop_idle_cleanup and stop.
+        """
+        self.stop_idle_cleanup()
+        self._cleanup_ttl = ttl
+        self._schedule_cleanup()
+
+    def stop_idle_cleanup(self):
+        """Cancel any scheduled idle cleanup and any cleanup pass in progress."""
+        self._cleanup_ttl = None
+        if self._cleanup_handle is not None:
+            self._cleanup_handle.cancel()
+            self._cleanup_handle = None
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+
+    def _schedule_cleanup(self):
+        """Arm the cleanup timer for the oldest tracked use, or a full TTL."""
+        ttl = self._cleanup_ttl
+        if ttl is None:
+            return
+        delay = ttl
+        if self._usage_heap:
+            delay = max(self._usage_heap[0][0] + ttl - time.monotonic(), 0)
+        loop = asyncio.get_running_loop()
+        self._cleanup_handle = loop.call_later(delay, self._cleanup_once)
+
+    def _cleanup_once(self):
+        """Timer callback: run one cleanup pass as a task."""
+        self._cleanup_handle = None
+        self._cleanup_task = asyncio.create_task(self._run_cleanup(self._cleanup_ttl))
+
+    async def _run_cleanup(self, ttl):
+        """Run cleanup_idle, then re-arm the timer unless cleanup was stopped."""
+        try:
+            await self.cleanup_idle(ttl)
+        except Exception as e:
+            logger.error(f"Idle cleanup failed: {e}")
+        finally:
+            if self._cleanup_task is asyncio.current_task():
+                self._cleanup_task = None
+        self._schedule_cleanup()
 
     def get_endpoints(self):
         """
@@ -265,10 +557,7 @@ class MCPServerManager:
         
         These endpoints can be used for direct HTTP communication with individual servers.
         """
-        return {
-            name: f"http://localhost:{self.proxy_port}/servers/{name}/"
-            for name in {**self.popular_servers, **self.dynamic_servers}
-        }
+        return {name: state.endpoint for name, state in self.servers.items()}
 
     def get_client_endpoints(self):
         """
@@ -281,10 +570,7 @@ class MCPServerManager:
         These endpoints are specifically designed for MCP client connections using
         Server-Sent Events (SSE) transport.
         """
-        return {
-            name: f"http://localhost:{self.proxy_port}/servers/{name}/sse"
-            for name in {**self.popular_servers, **self.dynamic_servers}
-        }
+        return {name: f"{state.endpoint}sse" for name, state in self.servers.items()}
 
     def get_client_config_path(self):
         """
@@ -307,10 +593,10 @@ class MCPServerManager:
                   and connection parameters optimized for SSE transport
         """
         servers = {}
-        for name in {**self.popular_servers, **self.dynamic_servers}.keys():
+        for name, state in self.servers.items():
             servers[name] = {
                 "type": "sse",
-                "url": f"http://localhost:{self.proxy_port}/servers/{name}/sse",
+                "url": f"{state.endpoint}sse",
                 "timeout": 5,
                 "sse_read_timeout": 300
             }
@@ -324,8 +610,7 @@ class MCPServerManager:
         and connect to all available servers through their SSE endpoints.
         """
         config = self._build_client_config()
-        with open(CLIENT_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+        _write_json_atomic(CLIENT_CONFIG_FILE, config)
         logger.info(f"Wrote MCP client config with {len(config['mcpServers'])} server endpoints")
 
     def update_client_config(self):
@@ -337,7 +622,8 @@ class MCPServerManager:
         """
         self._write_client_config()
 
-if __name__ == "__main__":
+async def main():
+    """Run the manager with example popular servers until interrupted."""
     # Example configuration for popular MCP servers
     POPULAR_SERVERS = {
         "tavily-mcp": {
@@ -360,14 +646,14 @@ if __name__ == "__main__":
     
     try:
         # Start the manager with popular servers
-        manager.start()
+        await manager.start()
         
         # Demonstrate dynamic server addition
         fetch_server_config = {
             "command": "uvx",
             "args": ["mcp-server-fetch"]
         }
-        manager.add_server("fetch", fetch_server_config)
+        await manager.add_server("fetch", fetch_server_config)
         
         # Display available client endpoints
         client_endpoints = manager.get_client_endpoints()
@@ -378,12 +664,15 @@ if __name__ == "__main__":
         logger.info(f"Client configuration written to: {manager.get_client_config_path()}")
         logger.info("MCP Proxy Manager running. Press Ctrl+C to stop.")
         
-        # Main loop with periodic cleanup
-        while True:
-            time.sleep(60)
-            manager.cleanup_idle(ttl=600)  # Clean up servers idle for 10+ minutes
-            
-    except KeyboardInterrupt:
-        logger.info("Shutting down...")
+        # Clean up servers idle for 10+ minutes until interrupted
+        manager.start_idle_cleanup(ttl=600)
+        await asyncio.Event().wait()
     finally:
-        manager.stop()
\ No newline at end of file
+        logger.info("Shutting down...")
+        await manager.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
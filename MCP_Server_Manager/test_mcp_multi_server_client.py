@@ -1,8 +1,12 @@
 import asyncio
-import json
 import logging
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
-from pydantic import BaseModel
+
+import orjson
+
+logger = logging.getLogger(__name__)
 
 # Try to import the full ClientSessionGroup implementation
 try:
@@ -17,7 +21,8 @@ except ImportError:
     import mcp
     from mcp.client.session import ClientSession
     
-    class SseServerParameters(BaseModel):
+    @dataclass(slots=True, frozen=True)
+    class SseServerParameters:
         """Parameters for initializing a sse_client."""
         url: str
         headers: dict[str, Any] | None = None
@@ -32,109 +37,92 @@ except ImportError:
             self.tools: Dict[str, Any] = {}
             self.resources: Dict[str, Any] = {}
             self.prompts: Dict[str, Any] = {}
-            self._session_contexts = {}
+            self._stack = AsyncExitStack()
         
         async def __aenter__(self):
+            await self._stack.__aenter__()
             return self
         
         async def __aexit__(self, exc_type, exc_val, exc_tb):
-            # Clean up sessions
-            for session_name, context in self._session_contexts.items():
-                try:
-                    await context.__aexit__(exc_type, exc_val, exc_tb)
-                except Exception as e:
-                    logging.warning(f"Error closing session {session_name}: {e}")
+            # Close every session and its SSE client in reverse order
+            return await self._stack.__aexit__(exc_type, exc_val, exc_tb)
         
         async def connect_to_server(self, server_name: str, server_params: SseServerParameters):
             """Connect to a single MCP server using SSE."""
+            # Contexts for this server are collected on their own stack, so a
+            # failed connection can be unwound without touching the others
+            server_stack = AsyncExitStack()
             try:
                 from mcp.client.sse import sse_client
                 
-                print(f"Connecting to {server_name} at {server_params.url}...")
+                logger.info(f"Connecting to {server_name} at {server_params.url}...")
                 
-                # Create SSE client context
-                client_context = sse_client(
+                # Enter the SSE client context
+                read, write = await server_stack.enter_async_context(sse_client(
                     url=server_params.url,
                     timeout=server_params.timeout,
                     sse_read_timeout=server_params.sse_read_timeout
-                )
-                
-                # Enter the context and store it for cleanup
-                read, write = await client_context.__aenter__()
-                self._session_contexts[server_name] = client_context
+                ))
                 
                 # Create and initialize session
-                session = ClientSession(read, write)
-                await session.__aenter__()
-                
-                # Initialize the session
+                session = await server_stack.enter_async_context(ClientSession(read, write))
                 result = await session.initialize()
                 server_info = result.serverInfo
-                print(f"✓ Connected to {server_name} - {server_info.name} v{server_info.version}")
-                
-                # Store the session
-                self.sessions[server_name] = session
-                
-                # Get tools, resources, and prompts
-                await self._aggregate_components(server_name, session)
-                
-                return session
-                
+                logger.info(f"✓ Connected to {server_name} - {server_info.name} v{server_info.version}")
             except Exception as e:
-                print(f"✗ Failed to connect to {server_name}: {e}")
+                logger.error(f"✗ Failed to connect to {server_name}: {e}")
                 # Clean up on failure
-                if server_name in self._session_contexts:
-                    try:
-                        await self._session_contexts[server_name].__aexit__(None, None, None)
-                        del self._session_contexts[server_name]
-                    except:
-                        pass
+                try:
+                    await server_stack.aclose()
+                except Exception:
+                    pass
                 return None
+            
+            # Hand the server's contexts to the group for cleanup on exit
+            await self._stack.enter_async_context(server_stack)
+            self.sessions[server_name] = session
+            
+            # Get tools, resources, and prompts
+            await self._aggregate_components(server_name, session)
+            
+            return session
         
         async def _aggregate_components(self, server_name: str, session: ClientSession):
             """Aggregate tools, resources, and prompts from a session."""
-            try:
-                # Get tools
-                tools_response = await session.list_tools()
-                tools = getattr(tools_response, "tools", [])
-                for tool in tools:
-                    tool_name = f"{server_name}.{tool.name}"
-                    self.tools[tool_name] = tool
-                    print(f"  - Tool: {tool.name} - {tool.description}")
-            except Exception as e:
-                logging.warning(f"Could not fetch tools from {server_name}: {e}")
-            
-            try:
-                # Get resources
-                resources_response = await session.list_resources()
-                resources = getattr(resources_response, "resources", [])
-                for resource in resources:
-                    resource_name = f"{server_name}.{resource.name}"
-                    self.resources[resource_name] = resource
-                    print(f"  - Resource: {resource.name} - {resource.description}")
-            except Exception as e:
-                logging.warning(f"Could not fetch resources from {server_name}: {e}")
-            
-            try:
-                # Get prompts
-                prompts_response = await session.list_prompts()
-                prompts = getattr(prompts_response, "prompts", [])
-                for prompt in prompts:
-                    prompt_name = f"{server_name}.{prompt.name}"
-                    self.prompts[prompt_name] = prompt
-                    print(f"  - Prompt: {prompt.name} - {prompt.description}")
-            except Exception as e:
-                logging.warning(f"Could not fetch prompts from {server_name}: {e}")
+            # The three listings are independent, so request them concurrently
+            tools_response, resources_response, prompts_response = await asyncio.gather(
+                session.list_tools(),
+                session.list_resources(),
+                session.list_prompts(),
+                return_exceptions=True,
+            )
+            self._register_components(server_name, tools_response, "tools", self.tools, "Tool")
+            self._register_components(server_name, resources_response, "resources", self.resources, "Resource")
+            self._register_components(server_name, prompts_response, "prompts", self.prompts, "Prompt")
+        
+        def _register_components(self, server_name: str, response: Any, attr: str,
+                                 registry: Dict[str, Any], label: str):
+            """Store the components from a list_* response under server-prefixed names."""
+            if isinstance(response, Exception):
+                logger.warning(f"Could not fetch {attr} from {server_name}: {response}")
+                return
+            components = getattr(response, attr, [])
+            registry.update({f"{server_name}.{c.name}": c for c in components})
+            if components and logger.isEnabledFor(logging.INFO):
+                # One record per component type rather than one per component
+                logger.info(f"{server_name} {attr}:\n" + "\n".join(
+                    f"  - {label}: {c.name} - {c.description}" for c in components
+                ))
 
 def load_mcp_config(config_file: str = "mcp_client_config.json") -> Dict[str, Any]:
     """Load MCP server configuration from JSON file."""
     try:
-        with open(config_file, 'r') as f:
-            return json.load(f)
+        with open(config_file, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         print(f"Configuration file {config_file} not found!")
         return {"mcpServers": {}}
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing configuration file: {e}")
         return {"mcpServers": {}}
 
@@ -286,7 +286,7 @@ class MCPServerManager:
         """
         logger.info(f"Adding server {name}")
         self.dynamic_servers[name] = config
-        self.last_used[name] = time.time()
+        self.last_used[name] = time.monotonic()
         self._write_proxy_config()  # This updates both proxy and Copilot configs
         self._start_proxy()
 
@@ -317,7 +317,7 @@ class MCPServerManager:
         
         This is used for idle cleanup to prevent removal of actively used servers.
         """
-        self.last_used[name] = time.time()
+        self.last_used[name] = time.monotonic()
 
     def cleanup_idle(self, ttl=600):
         """
@@ -329,7 +329,7 @@ class MCPServerManager:
         Only dynamically added servers are subject to cleanup. Popular servers
         are never removed by this method.
         """
-        now = time.time()
+        now = time.monotonic()
         to_remove = [name for name, last in self.last_used.items()
                      if name not in self.popular_servers and now - last > ttl]
         for name in to_remove:
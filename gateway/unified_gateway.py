@@ -12,11 +12,13 @@ import os
 import asyncio
 import logging
 import json
+from collections import Counter
 from typing import Dict, Any, List, Optional
 
 # Add parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import orjson
 from mcp.server.fastmcp import FastMCP
 from mcp.client.session import ClientSession
 from mcp.client.sse import sse_client
@@ -118,12 +120,19 @@ class WorkingUnifiedMCPGateway:
         logger.info(f"Gateway initialized with {len(self.tool_catalog)} tools from {len(self.server_urls)} servers")
     
     async def _discover_tools(self):
-        """Discover tools from all configured servers."""
-        for server_name, url in self.server_urls.items():
-            try:
-                await self._discover_tools_from_server(server_name, url)
-            except Exception as e:
-                logger.warning(f"Failed to discover tools from {server_name}: {e}")
+        """Discover tools from all configured servers concurrently.
+        
+        Each discovery opens and closes its own session within its task, so the
+        servers are independent and total time is bounded by the slowest one.
+        """
+        server_names = list(self.server_urls)
+        results = await asyncio.gather(
+            *(self._discover_tools_from_server(name, url) for name, url in self.server_urls.items()),
+            return_exceptions=True,
+        )
+        for server_name, result in zip(server_names, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to discover tools from {server_name}: {result}")
     
     async def _discover_tools_from_server(self, server_name: str, url: str):
         """Discover tools from a single server with retry logic."""
@@ -149,12 +158,15 @@ class WorkingUnifiedMCPGateway:
                         tools = getattr(tools_response, "tools", [])
                         logger.debug(f"Received {len(tools)} tools from {server_name}")
                         
+                        # Check the level once; the f-strings below are built per tool
+                        debug_enabled = logger.isEnabledFor(logging.DEBUG)
                         for tool in tools:
                             tool_key = f"{server_name}.{tool.name}"
                             output_schema = getattr(tool, "outputSchema", None)
-                            logger.debug(f"Processing tool: {tool.name}")
-                            logger.debug(f"  - inputSchema: {bool(tool.inputSchema)}")
-                            logger.debug(f"  - outputSchema: {bool(output_schema)} ({'null - this is normal' if output_schema is None else 'defined'})")
+                            if debug_enabled:
+                                logger.debug(f"Processing tool: {tool.name}")
+                                logger.debug(f"  - inputSchema: {bool(tool.inputSchema)}")
+                                logger.debug(f"  - outputSchema: {bool(output_schema)} ({'null - this is normal' if output_schema is None else 'defined'})")
                             
                             self.tool_catalog[tool_key] = {
                                 "server_name": server_name,
@@ -165,7 +177,8 @@ class WorkingUnifiedMCPGateway:
                                 "url": url,
                                 "description": getattr(tool, "description", "")
                             }
-                            logger.debug(f"Registered tool: {tool_key}")
+                            if debug_enabled:
+                                logger.debug(f"Registered tool: {tool_key}")
                         
                         logger.info(f"✓ Discovered {len(tools)} tools from {server_name}")
                         return  # Success, exit retry loop
@@ -224,10 +237,15 @@ class WorkingUnifiedMCPGateway:
             raise
     
     async def route_tool_call(self, tool_name: str, args: dict) -> Any:
-        """Route a tool call to the appropriate server."""
+        """Route a tool call to the appropriate server.
+        
+        In-process callers can await this directly instead of going through the
+        gateway's MCP transport.
+        """
         logger.info(f"Routing tool call: {tool_name}")
         
-        if tool_name not in self.tool_catalog:
+        tool_info = self.tool_catalog.get(tool_name)
+        if tool_info is None:
             available_tools = list(self.tool_catalog.keys())
             logger.error(f"Tool '{tool_name}' not found. Available: {available_tools}")
             return {
@@ -235,7 +253,6 @@ class WorkingUnifiedMCPGateway:
                 "available_tools": available_tools
             }
         
-        tool_info = self.tool_catalog[tool_name]
         server_name = tool_info["server_name"]
         actual_tool_name = tool_info["tool_name"]
         
@@ -256,9 +273,8 @@ class WorkingUnifiedMCPGateway:
                             # Try to parse as JSON if it looks like JSON
                             if text_content.strip().startswith(('[', '{')):
                                 try:
-                                    import json
-                                    return json.loads(text_content)
-                                except (json.JSONDecodeError, ValueError):
+                                    return orjson.loads(text_content)
+                                except orjson.JSONDecodeError:
                                     return text_content
                             return text_content
                         else:
@@ -314,11 +330,12 @@ class WorkingUnifiedMCPGateway:
         async def get_server_status() -> Dict[str, Any]:
             """Get the status of all configured servers."""
             status = {}
+            # Count tools per server in a single pass over the catalog
+            tool_counts = Counter(t["server_name"] for t in self.tool_catalog.values())
             for server_name, url in self.server_urls.items():
-                tools_count = len([t for t in self.tool_catalog.values() if t["server_name"] == server_name])
                 status[server_name] = {
                     "url": url,
-                    "tools_count": tools_count,
+                    "tools_count": tool_counts[server_name],
                     "configured": True,
                     "neo4j_available": self.neo4j_available
                 }
@@ -327,20 +344,8 @@ class WorkingUnifiedMCPGateway:
         @self.server.tool()
         async def test_server_connection(server_name: str) -> Dict[str, Any]:
             """Test connection to a specific server."""
-            if server_name not in self.server_urls:
-                return {"error": f"Server {server_name} not configured"}
-            
-            url = self.server_urls[server_name]
-            # Normalize hostname to avoid localhost vs 127.0.0.1 issues
-            url = url.replace("localhost", "127.0.0.1")
-            try:
-                async with sse_client(url=url, timeout=10.0) as (read, write):
-                    async with ClientSession(read, write) as session:
-                        await session.initialize()
-                        return {"status": "connected", "server": server_name, "url": url}
-            except Exception as e:
-                return {"status": "failed", "server": server_name, "error": str(e)}
-        
+            return await self.test_server_connection(server_name)
+
         @self.server.tool()
         async def get_system_info() -> Dict[str, Any]:
             """Get information about the gateway system configuration."""
@@ -352,7 +357,7 @@ class WorkingUnifiedMCPGateway:
                 "fallback_mode": not self.neo4j_available
             }
 
-def start_mcp_servers():
+async def start_mcp_servers():
     """Start the MCP server manager with popular servers and dynamic tool retriever."""
     PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
@@ -407,7 +412,7 @@ def start_mcp_servers():
     manager = MCPServerManager(popular_servers=POPULAR_SERVERS, proxy_port=9000)
     
     try:
-        manager.start()
+        await manager.start()
         logger.info("MCP Server Manager started successfully")
         if neo4j_available:
             logger.info("Running with Neo4j-enabled dynamic tool retriever")
@@ -418,28 +423,37 @@ def start_mcp_servers():
         logger.error(f"Failed to start MCP Server Manager: {e}")
         return None
 
+def event_loop_factory():
+    """Return uvloop's event loop factory if it is installed, else None for asyncio's default.
+    
+    uvloop does not support Windows, so the default loop is always used there.
+    """
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
 async def main():
     """Main function to run the working gateway."""
     logger.info("Starting Working Unified MCP Gateway...")
     
     # Start MCP servers
-    manager = start_mcp_servers()
+    manager = await start_mcp_servers()
     if not manager:
         logger.error("Failed to start MCP servers")
         return
     
-    # Wait longer for servers to start and add health check
+    # Wait for the proxy to accept connections instead of a fixed delay
     logger.info("Waiting for servers to fully initialize...")
-    await asyncio.sleep(10)  # Increased from 5 to 10 seconds
+    await manager.wait_until_ready()
     
     # Initialize gateway
     gateway = WorkingUnifiedMCPGateway()
     
     try:
-        # Wait a bit more and then test connectivity before tool discovery
-        logger.info("Testing server connectivity before tool discovery...")
-        await asyncio.sleep(2)
-        
         # Initialize from configuration with retry logic
         max_retries = 3
         for attempt in range(max_retries):
@@ -461,7 +475,8 @@ async def main():
                     raise
         
         logger.info("=== Working Unified MCP Gateway Ready ===")
-        logger.info(f"Available tools: {list(gateway.tool_catalog.keys())}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Available tools: {list(gateway.tool_catalog.keys())}")
         logger.info(f"Neo4j available: {gateway.neo4j_available}")
         logger.info("Starting FastMCP server on port 8000...")
         
@@ -482,9 +497,9 @@ async def main():
         logger.error(f"Gateway error: {e}")
     finally:
         if manager:
-            manager.stop()
+            await manager.stop()
         logger.info("Gateway shutdown complete")
 
 if __name__ == "__main__":
     # Run the gateway
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(), loop_factory=event_loop_factory())
\ No newline at end of file
@@ -70,7 +70,8 @@ class UnifiedMCPGateway:
             for tool in server.tools
         }
         logger.info(f"Unified tool catalog initialized with {len(self.tool_catalog)} tools.")
-        logger.info(f"Tool catalog: {list(self.tool_catalog.keys())}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Tool catalog: {list(self.tool_catalog.keys())}")
 
     async def route_tool_call(self, tool_name, args):
         logger.info(f"Routing tool call: {tool_name} with args: {args}")
@@ -120,7 +121,7 @@ async def call_tool_on_server(server_name, tool_name, args):
             await session.initialize()
             return await session.call_tool(tool_name, args)
 
-if __name__ == "__main__":
+async def main():
     PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     POPULAR_SERVERS = {
         "tavily-mcp": {
@@ -142,7 +143,13 @@ if __name__ == "__main__":
         }
     }
     manager = MCPServerManager(popular_servers=POPULAR_SERVERS, proxy_port=9000)
-    manager.start()
-    gateway = UnifiedMCPGateway(manager)
-    asyncio.run(gateway.initialize())
-    gateway.server.run() 
\ No newline at end of file
+    await manager.start()
+    try:
+        gateway = UnifiedMCPGateway(manager)
+        await gateway.initialize()
+        await gateway.server.run_stdio_async()
+    finally:
+        await manager.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
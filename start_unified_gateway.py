@@ -15,31 +15,55 @@ when Neo4j is not available, ensuring the gateway always works.
 
 import sys
 import os
+import argparse
 import asyncio
+import importlib.util
 import logging
+import shutil
 import subprocess
 import time
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import Optional
 
 # Add local bin to PATH for installed packages
 local_bin = os.path.expanduser("~/.local/bin")
-if local_bin not in os.environ.get("PATH", ""):
-    os.environ["PATH"] = f"{local_bin}:{os.environ.get('PATH', '')}"
+if local_bin not in os.environ.get("PATH", "").split(os.pathsep):
+    os.environ["PATH"] = f"{local_bin}{os.pathsep}{os.environ.get('PATH', '')}"
 
-# Add project directories to Python path
+# Add project directories to Python path once, ahead of site-packages
 PROJECT_ROOT = Path(__file__).parent.absolute()
-sys.path.append(str(PROJECT_ROOT))
-sys.path.append(str(PROJECT_ROOT / "gateway"))
-sys.path.append(str(PROJECT_ROOT / "MCP_Server_Manager"))
-sys.path.append(str(PROJECT_ROOT / "Dynamic_tool_retriever_MCP"))
+_PROJECT_PATHS = [
+    str(PROJECT_ROOT),
+    str(PROJECT_ROOT / "gateway"),
+    str(PROJECT_ROOT / "MCP_Server_Manager"),
+    str(PROJECT_ROOT / "Dynamic_tool_retriever_MCP"),
+]
+sys.path[:0] = [p for p in _PROJECT_PATHS if p not in sys.path]
+
+# Settings read during startup, snapshotted once after .env is loaded
+_CFG_KEYS = (
+    "LOG_LEVEL", "NEO4J_URI", "NEO4J_USER", "NEO4J_PASSWORD",
+    "NEO4J_CONN_TIMEOUT", "GATEWAY_PORT", "PROXY_PORT",
+)
+_CFG = {}
+_ENV_LOADED = False
+
+def _ensure_env():
+    """Load .env on first use and return the startup settings snapshot."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _CFG.update({key: os.getenv(key) for key in _CFG_KEYS})
+        _ENV_LOADED = True
+    return _CFG
 
 def setup_logging():
     """Setup logging configuration."""
-    from dotenv import load_dotenv
-    load_dotenv()
+    cfg = _ensure_env()
     
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    log_level = (cfg["LOG_LEVEL"] or "INFO").upper()
     logging.basicConfig(
         level=getattr(logging, log_level, logging.INFO),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -68,21 +92,17 @@ def check_dependencies():
     missing_required = []
     missing_optional = []
     
+    # Locate packages without importing them, so heavy modules are not loaded here
     for package in required_packages:
-        try:
-            # Handle special cases for package import names
-            import_name = package.replace("-", "_")
-            if package == "python-dotenv":
-                import_name = "dotenv"
-            __import__(import_name)
-        except ImportError:
+        # Handle special cases for package import names
+        import_name = package.replace("-", "_")
+        if package == "python-dotenv":
+            import_name = "dotenv"
+        if importlib.util.find_spec(import_name) is None:
             missing_required.append(package)
     
     for package, description in optional_packages:
-        try:
-            __import__(package.replace("-", "_"))
-        except (ImportError, OSError, ModuleNotFoundError):
-            # Catch ImportError, OSError (for DLL loading issues), and ModuleNotFoundError
+        if importlib.util.find_spec(package.replace("-", "_")) is None:
             missing_optional.append((package, description))
     
     if missing_required:
@@ -98,23 +118,40 @@ def check_dependencies():
     
     return True
 
-def check_node_dependencies():
-    """Check if required Node.js packages are available."""
+def log_tool_version(logger, path: str):
+    """Log the version reported by an executable; only used with --verbose."""
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=30)
+        logger.info(f"  {path}: {result.stdout.strip() or result.stderr.strip()}")
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"  Could not read version of {path}: {e}")
+
+def check_node_dependencies(verbose: bool = False):
+    """
+    Check if required Node.js packages are available on PATH.
+    
+    Args:
+        verbose (bool, optional): Also run each tool to log its version. Defaults to False.
+    """
     logger = logging.getLogger("UnifiedGatewayStartup")
     
     # Check if npx is available (optional - some servers use uvx instead)
-    try:
-        subprocess.run(["npx", "--version"], check=True, capture_output=True)
+    npx_path = shutil.which("npx")
+    if npx_path:
         logger.info("✓ npx is available")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        if verbose:
+            log_tool_version(logger, npx_path)
+    else:
         logger.warning("✗ npx not found. Node.js-based MCP servers will not be available")
         logger.warning("Install Node.js from https://nodejs.org/ to enable Node.js-based servers")
     
     # Check if uvx is available (optional)
-    try:
-        subprocess.run(["uvx", "--version"], check=True, capture_output=True)
+    uvx_path = shutil.which("uvx")
+    if uvx_path:
         logger.info("✓ uvx is available")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        if verbose:
+            log_tool_version(logger, uvx_path)
+    else:
         logger.warning("✗ uvx not found. Some Python-based servers may not be available")
         logger.warning("Install with: pip install --break-system-packages uv")
     
@@ -126,35 +163,47 @@ def validate_environment():
     """Validate environment configuration."""
     logger = logging.getLogger("UnifiedGatewayStartup")
     
-    from dotenv import load_dotenv
-    load_dotenv()
+    cfg = _ensure_env()
     
     # Check Neo4j configuration (optional)
-    neo4j_uri = os.getenv("NEO4J_URI")
-    neo4j_user = os.getenv("NEO4J_USER") 
-    neo4j_password = os.getenv("NEO4J_PASSWORD")
+    neo4j_uri = cfg["NEO4J_URI"]
+    neo4j_user = cfg["NEO4J_USER"]
+    neo4j_password = cfg["NEO4J_PASSWORD"]
     
     neo4j_configured = bool(neo4j_uri and neo4j_user and neo4j_password)
     
     if neo4j_configured:
         logger.info("✓ Neo4j configuration found - dynamic tool retriever will be enabled")
+        error = None
         try:
             from neo4j import GraphDatabase
-            driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
-            with driver.session() as session:
-                session.run("RETURN 1")
-            driver.close()
+            from neo4j.exceptions import DriverError, Neo4jError
+        except ImportError as e:
+            error = e
+        else:
+            try:
+                with GraphDatabase.driver(
+                    neo4j_uri,
+                    auth=(neo4j_user, neo4j_password),
+                    # Fail fast on an unreachable or misconfigured URI
+                    connection_timeout=float(cfg["NEO4J_CONN_TIMEOUT"] or 2),
+                ) as driver:
+                    driver.verify_connectivity()
+            except (DriverError, Neo4jError) as e:
+                # ServiceUnavailable, AuthError, ConfigurationError, ...
+                error = e
+        if error is None:
             logger.info("✓ Neo4j connection verified")
-        except Exception as e:
-            logger.warning(f"✗ Neo4j connection failed: {e}")
+        else:
+            logger.warning(f"✗ Neo4j connection failed: {error}")
             logger.warning("System will fallback to everything server")
             neo4j_configured = False
     else:
         logger.info("ℹ Neo4j not configured - using fallback mode with everything server")
     
     # Validate ports
-    gateway_port = int(os.getenv("GATEWAY_PORT", 8000))
-    proxy_port = int(os.getenv("PROXY_PORT", 9000))
+    gateway_port = int(cfg["GATEWAY_PORT"] or 8000)
+    proxy_port = int(cfg["PROXY_PORT"] or 9000)
     
     logger.info(f"Gateway will run on port {gateway_port}")
     logger.info(f"Proxy will run on port {proxy_port}")
@@ -169,20 +218,35 @@ def install_mcp_proxy():
     """Install mcp-proxy if not available."""
     logger = logging.getLogger("UnifiedGatewayStartup")
     
+    # Check if mcp-proxy is already installed, from package metadata first and
+    # then on PATH for installs outside this interpreter (e.g. uv tool, pipx)
     try:
-        # Check if mcp-proxy is already installed
-        subprocess.run(["mcp-proxy", "--version"], check=True, capture_output=True)
+        logger.info(f"✓ mcp-proxy {version('mcp-proxy')} is already available")
+        return True
+    except PackageNotFoundError:
+        pass
+    if shutil.which("mcp-proxy"):
         logger.info("✓ mcp-proxy is already available")
         return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        logger.info("Installing mcp-proxy...")
-        try:
-            subprocess.run(["pip", "install", "--break-system-packages", "mcp-proxy"], check=True)
-            logger.info("✓ mcp-proxy installed successfully")
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.error(f"✗ Failed to install mcp-proxy: {e}")
-            return False
+    
+    logger.info("Installing mcp-proxy...")
+    try:
+        subprocess.run(["pip", "install", "--break-system-packages", "mcp-proxy"], check=True)
+        logger.info("✓ mcp-proxy installed successfully")
+        return True
+    except subprocess.CalledProcessError as e:
+        logger.error(f"✗ Failed to install mcp-proxy: {e}")
+        return False
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Start the Unified MCP Gateway system")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log the versions of npx and uvx (runs each tool)",
+    )
+    return parser.parse_args()
 
 async def start_gateway_system():
     """Start the complete gateway system."""
@@ -203,6 +267,7 @@ async def start_gateway_system():
 
 def main():
     """Main startup function."""
+    args = parse_args()
     logger = setup_logging()
     logger.info("=" * 60)
     logger.info("🚀 MCP Unified Gateway System Startup")
@@ -216,7 +281,7 @@ def main():
     
     # Step 2: Check Node.js dependencies (optional)
     logger.info("📦 Checking Node.js dependencies...")
-    check_node_dependencies()  # Warning only, doesn't block startup
+    check_node_dependencies(verbose=args.verbose)  # Warning only, doesn't block startup
     
     # Step 3: Install mcp-proxy if needed
     logger.info("📦 Checking mcp-proxy...")
@@ -245,7 +310,9 @@ def main():
     
     # Step 6: Start the system
     try:
-        asyncio.run(start_gateway_system())
+        # Imported only now, after the checks above have reported missing dependencies
+        from gateway.unified_gateway import event_loop_factory
+        asyncio.run(start_gateway_system(), loop_factory=event_loop_factory())
     except KeyboardInterrupt:
         logger.info("👋 Goodbye!")
     except Exception as e: